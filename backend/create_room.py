@@ -3,63 +3,70 @@
 Create a custom game room with a specific target word.
 
 Usage:
-    python create_room.py <target_word>
+    python create_room.py <target_word> [room_code]
+    python create_room.py --many <target_word> [<target_word> ...]
     
 Example:
     python create_room.py routine
+    python create_room.py --many routine apple river
+
+Uses socketio.AsyncClient, which needs aiohttp (see requirements-dev.txt):
+    pip install -r requirements-dev.txt
 """
 
 import sys
+import asyncio
 import random
 import string
 import socketio
+from orjson_serializer import OrjsonSerializer
 
 def generate_room_code():
     """Generate a random 6-character room code."""
     return ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
 
-def create_room(target_word, room_code=None):
+async def create_room(target_word, room_code=None):
     """Create a room with the given target word and return the room code."""
     if room_code is None:
         room_code = generate_room_code()
     
-    sio = socketio.Client()
+    sio = socketio.AsyncClient(json=OrjsonSerializer)
     result = {"success": False, "room_code": room_code}
     
     @sio.event
-    def connect():
-        sio.emit('join_room', {
+    async def connect():
+        await sio.emit('join_room', {
             'room_id': room_code,
             'player_name': 'room-creator',
             'target_word': target_word
         })
     
     @sio.event
-    def room_state(data):
+    async def room_state(data):
         if not data.get("ready"):
             return
         result["success"] = True
         result["total_words"] = data.get("total_words", 0)
-        sio.disconnect()
+        await sio.disconnect()
     
     @sio.event
-    def room_loading(data):
+    async def room_loading(data):
         if data.get('msg'):
-            print(f"  {data['msg']}", file=sys.stderr)
+            print(f"  [{room_code}] {data['msg']}", file=sys.stderr)
     
     @sio.event
-    def connect_error(data):
+    async def connect_error(data):
         print(f"Connection failed: {data}", file=sys.stderr)
-        sio.disconnect()
+        await sio.disconnect()
 
     @sio.event
-    def error(data):
+    async def error(data):
         print(f"Server error: {data}", file=sys.stderr)
-        sio.disconnect()
+        await sio.disconnect()
     
     try:
-        sio.connect('http://localhost:8000', wait_timeout=10)
-        sio.wait()
+        await sio.connect('http://localhost:8000', wait_timeout=10)
+        await sio.wait()
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return None
@@ -68,18 +75,42 @@ def create_room(target_word, room_code=None):
         return result
     return None
 
+async def create_rooms(target_words):
+    """Create one room per target word concurrently; results are in input order (None on failure)."""
+    return await asyncio.gather(*(create_room(word) for word in target_words))
+
+def main_many(target_words):
+    print(f"Creating {len(target_words)} rooms: {', '.join(target_words)}")
+    results = asyncio.run(create_rooms(target_words))
+
+    print(f"\n{'='*40}")
+    for target_word, result in zip(target_words, results):
+        if result:
+            print(f"{result['room_code']}  {target_word} ({result['total_words']} words)")
+        else:
+            print(f"FAILED  {target_word}")
+    print(f"{'='*40}")
+    if not all(results):
+        sys.exit(1)
+
 def main():
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 2 or (sys.argv[1] == "--many" and len(sys.argv) < 3):
         print("Usage: python create_room.py <target_word> [room_code]")
+        print("       python create_room.py --many <target_word> [<target_word> ...]")
         print("Example: python create_room.py routine")
         print("         python create_room.py routine my-custom-room")
+        print("         python create_room.py --many routine apple river")
         sys.exit(1)
+
+    if sys.argv[1] == "--many":
+        main_many([w.lower().strip() for w in sys.argv[2:]])
+        return
     
     target_word = sys.argv[1].lower().strip()
     room_code = sys.argv[2] if len(sys.argv) > 2 else None
     
     print(f"Creating room with target word: {target_word}")
-    result = create_room(target_word, room_code)
+    result = asyncio.run(create_room(target_word, room_code))
     
     if result:
         print(f"\n{'='*40}")
@@ -4,16 +4,38 @@ import urllib.request
 import os
 import random
 import asyncio
+import functools
+import itertools
+import logging
 import threading
-import re
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import simsimd
+
+logger = logging.getLogger(__name__)
 
 # The spaCy model will handle lemmatization.
-# IMPORTANT: We lazy-load it to avoid long cold-starts (e.g. on Railway).
+# IMPORTANT: We lazy-load it to avoid long cold-starts (e.g. on Railway). main.py warms
+# it in a background task after startup, so the server answers healthchecks meanwhile.
 
 VOCAB_URL = "https://raw.githubusercontent.com/first20hours/google-10000-english/master/google-10000-english-no-swears.txt"
 VOCAB_FILE = "vocab.txt"
 
+# On-disk cache of everything ensure_global_vocab_cache() derives from spaCy (target
+# pool, family keys, vector matrix), rebuilt when vocab.txt is newer or the tag
+# (VOCAB_CACHE_VERSION + spaCy model name/version) differs. Bump the version whenever
+# the stored layout, vector preprocessing or the word filters/family rules change.
+VOCAB_VECTORS_CACHE_FILE = "vocab_vectors.npz"
+VOCAB_CACHE_VERSION = 2
+
+# In-memory dtype of the shared vocab matrix. Set VOCAB_VECTOR_DTYPE=float16 on small
+# instances to halve its footprint, or VOCAB_VECTOR_DTYPE=int8 to quarter it (rows are
+# quantized with a per-row scale). SimSIMD has native float16/int8 kernels, so the ranking
+# sweep stays fast, but ranks can shift by a place or two between near-tied words.
+# Guess similarities still come from the float32 model vectors; the top-10 list and
+# rank estimates for out-of-vocab words use the quantized sweep values.
+VOCAB_VECTOR_DTYPE = np.dtype(os.environ.get("VOCAB_VECTOR_DTYPE", "float32"))
+
 # Keep the model loaded globally so it's not reloaded per room
 _nlp = None
 _nlp_lock = threading.Lock()
@@ -31,17 +53,17 @@ def get_nlp():
         # Default to a smaller model for production (e.g. 1GB Railway instances).
         # Override with SPACY_MODEL=en_core_web_lg if you have enough RAM.
         model_name = os.environ.get("SPACY_MODEL", "en_core_web_md")
-        print(f"Loading Spacy model ({model_name})...")
+        logger.info("Loading Spacy model (%s)...", model_name)
         try:
-            # We don't need the full parsing/NER pipeline for gameplay.
-            _nlp = spacy.load(model_name, disable=["parser", "ner", "senter"])
+            # We don't need the full parsing/NER pipeline for gameplay. Excluding (rather
+            # than disabling) skips loading those weights at all. The lemmatizer still gets
+            # POS from tok2vec -> tagger -> attribute_ruler, which stay enabled.
+            _nlp = spacy.load(model_name, exclude=["parser", "ner", "senter"])
         except OSError:
-            print(f"Model not found: {model_name}. Run: python -m spacy download {model_name}")
+            logger.error("Model not found: %s. Run: python -m spacy download %s", model_name, model_name)
             _nlp = None
         return _nlp
 
-profanity.load_censor_words()
-
 # POS tags that indicate meaningful, tangible words (nouns, verbs, adjectives, adverbs)
 MEANINGFUL_POS_TAGS = {"NOUN", "VERB", "ADJ", "ADV", "PROPN"}
 
@@ -56,14 +78,49 @@ DISALLOWED_TARGET_ENTITY_TYPES = {"GPE", "LOC", "FAC"}
 # Minimum word length for target words
 MIN_WORD_LENGTH = 4
 
+# Common auxiliary/function verbs, excluded even when tagged as VERB
+FUNCTION_VERBS = frozenset({
+    "be", "is", "are", "was", "were", "been", "being",
+    "have", "has", "had", "having", "do", "does", "did",
+    "will", "would", "shall", "should", "may", "might",
+    "can", "could", "must",
+})
+
+# Batch size for nlp.pipe() over the top-2000 random target candidates
+FILTER_BATCH_SIZE = 256
+
+# Batch size for the one-time nlp.pipe() family-key pass over the full vocab. It stays
+# single-process: worker processes each reload the model and measured ~24x slower here.
+VOCAB_PIPE_BATCH_SIZE = 1000
+
+# Max distinct words whose vector lookups are memoized (see _lookup_word_vector)
+WORD_VECTOR_CACHE_SIZE = 50000
+
+# Max distinct out-of-vocab words whose family keys are memoized (see get_word_family_key)
+FAMILY_KEY_CACHE_SIZE = 50000
+
 _cache_lock = threading.Lock()
+# Serializes async callers so rooms that join during a cold build wait on the event
+# loop instead of each parking a to_thread worker on _cache_lock.
+_cache_build_lock = asyncio.Lock()
 _cached_vocab = None
 _cached_meaningful_vocab = None
 _cached_vocab_words_with_vectors = None
-_cached_vocab_vectors = None
+_cached_vocab_unit_vectors = None
 _cached_vocab_vector_norms = None
+_cached_zero_vector_rows = None
 _cached_vector_dim = None
 _cached_family_keys = None
+_cached_family_ids = None
+_cached_family_id_keys = None
+_cached_family_order = None
+_cached_family_starts = None
+
+# Memoized _compute_ranks() results per target word, oldest evicted first. Each entry
+# is ~2 MB for the 10k vocab, so keep this small on constrained instances.
+TARGET_RANKS_CACHE_SIZE = max(0, int(os.environ.get("TARGET_RANKS_CACHE_SIZE", "16")))
+_target_ranks_cache = {}
+_target_ranks_lock = asyncio.Lock()
 
 
 def _word_family_key_from_token(token, normalized):
@@ -102,9 +159,9 @@ def _word_family_key_from_token(token, normalized):
     return normalized
 
 
-def load_vocab():
+def _ensure_vocab_file():
     if not os.path.exists(VOCAB_FILE):
-        print("Downloading vocabulary list...")
+        logger.info("Downloading vocabulary list...")
         import ssl
 
         ctx = ssl.create_default_context()
@@ -113,8 +170,41 @@ def load_vocab():
         with urllib.request.urlopen(VOCAB_URL, context=ctx) as response, open(VOCAB_FILE, "wb") as out_file:
             out_file.write(response.read())
 
-    with open(VOCAB_FILE, "r") as f:
-        return [line.strip().lower() for line in f if line.strip()]
+
+def _load_profane_words():
+    """Load better_profanity's censor list, expanded to every letters-only spelling it matches.
+
+    Guesses are a single [a-z]+ word, so a set lookup gives the same answer as
+    profanity.contains_profanity() without its per-call variant matching.
+    """
+    profanity.load_censor_words()
+    words = set()
+    for censor_word in profanity.CENSOR_WORDSET:
+        # Each VaryingString keeps the substitutions allowed per character (e.g. 'i' -> 'l', '1').
+        letter_options = [
+            [c for c in chars if c.isascii() and c.isalpha()] for chars in censor_word._char_combos
+        ]
+        words.update("".join(letters) for letters in itertools.product(*letter_options))
+    return frozenset(words)
+
+
+# Independent startup I/O (censor list, vocab download) starts in the background at import
+# so it overlaps server startup and the lazy spaCy load; consumers block on the futures
+# only when they need the result.
+_startup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="game-startup")
+_profanity_future = _startup_executor.submit(_load_profane_words)
+_vocab_file_future = _startup_executor.submit(_ensure_vocab_file)
+
+
+def load_vocab():
+    if _vocab_file_future.exception() is not None:
+        # The import-time download failed (e.g. network not up yet); retry it here like
+        # every other room init would, instead of re-raising that first error forever.
+        _ensure_vocab_file()
+    # One read + C-level lower()/split(); entries are one word per line, so splitting on
+    # whitespace also drops blank lines and stray padding.
+    with open(VOCAB_FILE, "rb") as f:
+        return f.read().decode("utf-8").lower().split()
 
 
 def _filter_meaningful_vocab(vocab):
@@ -125,99 +215,258 @@ def _filter_meaningful_vocab(vocab):
     - excluding function words
     - avoiding cases like 'days' -> 'day' (too short)
     """
-    print("Filtering vocabulary for meaningful random target words...")
+    logger.info("Filtering vocabulary for meaningful random target words...")
+    nlp = get_nlp()
+    if nlp is None:
+        return []
+
+    # One batched pipe pass over the words that survive the cheap checks: each Doc
+    # supplies POS, entity type and lemma at once.
+    candidates = [w for w in vocab[:2000] if _passes_cheap_word_checks(w)]
     meaningful = []
-    for w in vocab[:2000]:
-        if not is_valid_random_target_word(w):
+    for w, doc in zip(candidates, nlp.pipe(candidates, batch_size=FILTER_BATCH_SIZE)):
+        if len(doc) == 0:
+            continue
+        if not _is_valid_random_target_token(doc[0], w):
             continue
         meaningful.append(w)
-    print(f"Found {len(meaningful)} meaningful words from top 2000")
+    logger.info("Found %d meaningful words from top 2000", len(meaningful))
     return meaningful
 
 
+def _model_vector(nlp, word):
+    """Return the model's vector for `word` (a view into the vector table), or None.
+
+    Reads the key -> row map directly, so looking up a word doesn't intern a new
+    Lexeme in the shared vocab (which `nlp.vocab[word]` would, for every guess).
+    """
+    vectors = nlp.vocab.vectors
+    if vectors.mode != "default":
+        # floret tables have no key -> row map; go through the Lexeme instead.
+        lex = nlp.vocab[word]
+        return lex.vector if lex.has_vector else None
+    row = vectors.key2row.get(nlp.vocab.strings[word])
+    return None if row is None else vectors.data[row]
+
+
+def _build_vocab_vectors(nlp, vocab):
+    """Return (words, L2-normalized float32 matrix, float32 norms) for vocab words with vectors."""
+    words_with_vectors = []
+    vectors = []
+    for w in vocab:
+        normalized = (w or "").lower().strip()
+        if not normalized:
+            continue
+        vec = _model_vector(nlp, normalized)
+        if vec is not None:
+            words_with_vectors.append(normalized)
+            vectors.append(vec)
+
+    if not vectors:
+        return words_with_vectors, np.zeros((0, 0), dtype=np.float32), np.zeros((0,), dtype=np.float32)
+
+    mat = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1)
+    # Row-normalize once so ranking a target is a single matvec (cosine == dot).
+    mat /= np.maximum(norms, 1e-12)[:, None]
+    return words_with_vectors, mat, norms.astype(np.float32)
+
+
+def _quantize_rows_int8(mat):
+    """Scale each row so its largest component maps to +/-127 and round to int8.
+
+    Per-row scales don't matter for cosine similarity, so they aren't kept.
+    """
+    mat = np.atleast_2d(mat)
+    scale = 127.0 / np.maximum(np.abs(mat).max(axis=1, keepdims=True), 1e-12)
+    return np.round(mat * scale).astype(np.int8)
+
+
+def _vocab_cache_tag(nlp):
+    meta = nlp.meta
+    return f"v{VOCAB_CACHE_VERSION}:{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}"
+
+
+def _load_vocab_cache(nlp):
+    """Load a saved (meaningful_vocab, family_keys, words, unit_vectors, norms) tuple.
+
+    Returns None if the file is missing, older than vocab.txt or built by another model.
+    """
+    try:
+        if os.path.getmtime(VOCAB_VECTORS_CACHE_FILE) < os.path.getmtime(VOCAB_FILE):
+            return None
+        with np.load(VOCAB_VECTORS_CACHE_FILE, allow_pickle=False) as data:
+            if str(data["tag"]) != _vocab_cache_tag(nlp):
+                return None
+            family_keys = dict(zip(data["family_key_words"].tolist(), data["family_key_values"].tolist()))
+            return (
+                data["meaningful_vocab"].tolist(),
+                family_keys,
+                data["words"].tolist(),
+                data["unit_vectors"],
+                data["norms"],
+            )
+    except (OSError, KeyError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning("Ignoring unreadable vocab cache: %s", e)
+        return None
+
+
+def _save_vocab_cache(nlp, meaningful_vocab, family_keys, words_with_vectors, unit_vectors, norms):
+    tmp_path = VOCAB_VECTORS_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                tag=np.array(_vocab_cache_tag(nlp)),
+                meaningful_vocab=np.array(meaningful_vocab, dtype=str),
+                family_key_words=np.array(list(family_keys), dtype=str),
+                family_key_values=np.array(list(family_keys.values()), dtype=str),
+                words=np.array(words_with_vectors, dtype=str),
+                unit_vectors=unit_vectors,
+                norms=norms,
+            )
+        os.replace(tmp_path, VOCAB_VECTORS_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Could not write vocab cache: %s", e)
+
+
+def _build_family_keys(nlp, vocab):
+    """Map every vocab word to its family key in one nlp.pipe pass."""
+    family_keys = {}
+    docs = nlp.pipe(vocab, batch_size=VOCAB_PIPE_BATCH_SIZE)
+    for i, (w, doc) in enumerate(zip(vocab, docs)):
+        normalized = (w or "").lower().strip()
+        if not normalized:
+            continue
+
+        if doc is None or len(doc) == 0:
+            family_keys[normalized] = normalized
+        else:
+            token = doc[0]
+            family_keys[normalized] = _word_family_key_from_token(token, normalized)
+
+        if i > 0 and i % 1000 == 0:
+            logger.debug("  cached %d/%d words", i, len(vocab))
+    return family_keys
+
+
+def _vocab_cache_ready():
+    return (
+        _cached_vocab is not None
+        and _cached_meaningful_vocab is not None
+        and _cached_vocab_words_with_vectors is not None
+        and _cached_vocab_unit_vectors is not None
+        and _cached_vocab_vector_norms is not None
+        and _cached_zero_vector_rows is not None
+        and _cached_vector_dim is not None
+        and _cached_family_keys is not None
+        and _cached_family_ids is not None
+        and _cached_family_id_keys is not None
+        and _cached_family_order is not None
+        and _cached_family_starts is not None
+    )
+
+
 def ensure_global_vocab_cache():
     global _cached_vocab
     global _cached_meaningful_vocab
     global _cached_vocab_words_with_vectors
-    global _cached_vocab_vectors
+    global _cached_vocab_unit_vectors
     global _cached_vocab_vector_norms
+    global _cached_zero_vector_rows
     global _cached_vector_dim
     global _cached_family_keys
+    global _cached_family_ids
+    global _cached_family_id_keys
+    global _cached_family_order
+    global _cached_family_starts
 
     nlp = get_nlp()
     if nlp is None:
         raise RuntimeError("Spacy model not loaded.")
 
-    if (
-        _cached_vocab is not None
-        and _cached_meaningful_vocab is not None
-        and _cached_vocab_words_with_vectors is not None
-        and _cached_vocab_vectors is not None
-        and _cached_vocab_vector_norms is not None
-        and _cached_vector_dim is not None
-        and _cached_family_keys is not None
-    ):
+    if _vocab_cache_ready():
         return
 
     with _cache_lock:
-        if (
-            _cached_vocab is not None
-            and _cached_meaningful_vocab is not None
-            and _cached_vocab_words_with_vectors is not None
-            and _cached_vocab_vectors is not None
-            and _cached_vocab_vector_norms is not None
-            and _cached_vector_dim is not None
-            and _cached_family_keys is not None
-        ):
+        if _vocab_cache_ready():
             return
 
         vocab = load_vocab()
-        meaningful_vocab = _filter_meaningful_vocab(vocab)
-
-        family_keys = {}
-        words_with_vectors = []
-        vectors = []
-
-        print("Precomputing family keys and vector cache...")
-        for i, (w, doc) in enumerate(zip(vocab, nlp.pipe(vocab, batch_size=512))):
-            normalized = (w or "").lower().strip()
-            if not normalized:
-                continue
-
-            if doc is None or len(doc) == 0:
-                family_keys[normalized] = normalized
-            else:
-                token = doc[0]
-                family_keys[normalized] = _word_family_key_from_token(token, normalized)
-
-            lex = nlp.vocab[normalized]
-            if lex.has_vector:
-                words_with_vectors.append(normalized)
-                vectors.append(lex.vector)
-
-            if i > 0 and i % 1000 == 0:
-                print(f"  cached {i}/{len(vocab)} words")
+        cache = _load_vocab_cache(nlp)
+        if cache is None:
+            logger.info("Precomputing family keys and vector cache...")
+            cache = (
+                _filter_meaningful_vocab(vocab),
+                _build_family_keys(nlp, vocab),
+                *_build_vocab_vectors(nlp, vocab),
+            )
+            _save_vocab_cache(nlp, *cache)
+        else:
+            logger.info("Loaded vocab cache from %s", VOCAB_VECTORS_CACHE_FILE)
+        meaningful_vocab, family_keys, words_with_vectors, unit_vectors, norms = cache
+
+        # Integer family id per vector row, numbered in first-appearance order.
+        family_id_by_key = {}
+        family_ids = np.empty(len(words_with_vectors), dtype=np.int32)
+        for row, w in enumerate(words_with_vectors):
+            family_key = family_keys.get(w, w)
+            family_ids[row] = family_id_by_key.setdefault(family_key, len(family_id_by_key))
+        # Rows grouped by family id (stable, so each run stays in row order) and the
+        # offset where each family's run starts, for np.maximum.reduceat per target.
+        family_order = np.argsort(family_ids, kind="stable")
+        grouped_ids = family_ids[family_order]
+        family_starts = np.flatnonzero(np.diff(grouped_ids, prepend=-1))
+
+        if VOCAB_VECTOR_DTYPE == np.int8:
+            shared_unit_vectors = _quantize_rows_int8(unit_vectors)
+        else:
+            shared_unit_vectors = unit_vectors.astype(VOCAB_VECTOR_DTYPE, copy=False)
+        zero_vector_rows = np.flatnonzero(norms == 0)
+        # Every room references these arrays directly; freeze them so an in-place edit
+        # in one game can't leak into the others.
+        for arr in (shared_unit_vectors, norms, zero_vector_rows, family_ids, family_order, family_starts):
+            arr.setflags(write=False)
 
         _cached_vocab = vocab
         _cached_meaningful_vocab = meaningful_vocab
         _cached_family_keys = family_keys
         _cached_vocab_words_with_vectors = words_with_vectors
-        if vectors:
-            mat = np.asarray(vectors, dtype=np.float32)
-            _cached_vocab_vectors = mat
-            norms = np.linalg.norm(mat, axis=1)
-            _cached_vocab_vector_norms = norms.astype(np.float32)
-            _cached_vector_dim = int(mat.shape[1])
-        else:
-            _cached_vocab_vectors = np.zeros((0, 0), dtype=np.float32)
-            _cached_vocab_vector_norms = np.zeros((0,), dtype=np.float32)
-            _cached_vector_dim = 0
+        _cached_vocab_unit_vectors = shared_unit_vectors
+        _cached_vocab_vector_norms = norms
+        _cached_zero_vector_rows = zero_vector_rows
+        _cached_vector_dim = int(unit_vectors.shape[1])
+        _cached_family_ids = family_ids
+        _cached_family_id_keys = list(family_id_by_key)
+        _cached_family_order = family_order
+        _cached_family_starts = family_starts
 
 
 async def ensure_global_vocab_cache_async(emit_cb=None):
+    if _vocab_cache_ready():
+        return
     if emit_cb:
         await emit_cb("Preparing vocabulary cache...")
-    await asyncio.to_thread(ensure_global_vocab_cache)
+    async with _cache_build_lock:
+        if _vocab_cache_ready():
+            return
+        await asyncio.to_thread(ensure_global_vocab_cache)
+
+
+@functools.lru_cache(maxsize=WORD_VECTOR_CACHE_SIZE)
+def _lookup_word_vector(word):
+    """Return (float32 vector, norm) for `word`, or None if the model has no vector for it.
+
+    Callers must make sure the model is loaded. The returned vector is a read-only view
+    into the model's (float32) vector table, so cached entries don't hold row copies.
+    """
+    vec = _model_vector(get_nlp(), word)
+    if vec is None:
+        return None
+    vec = np.asarray(vec, dtype=np.float32).view()
+    vec.flags.writeable = False
+    return vec, float(np.linalg.norm(vec) or 0.0)
 
 
 def get_word_family_key(word):
@@ -229,19 +478,63 @@ def get_word_family_key(word):
     - verb inflections (to verb lemma)
 
     All other forms keep their original lowercase surface form.
+
+    Vocab words are answered from the table built by ensure_global_vocab_cache(), so
+    only words outside the vocab pay for a pipeline run, and only once each.
     """
     normalized = word.lower().strip()
-    nlp = get_nlp()
-    if nlp is None or not normalized:
+    family_keys = _cached_family_keys
+    if family_keys is not None and normalized in family_keys:
+        return family_keys[normalized]
+
+    if get_nlp() is None or not normalized:
         return normalized
 
-    doc = nlp(normalized)
+    return _compute_word_family_key(normalized)
+
+
+@functools.lru_cache(maxsize=FAMILY_KEY_CACHE_SIZE)
+def _compute_word_family_key(normalized):
+    doc = get_nlp()(normalized)
     if len(doc) == 0:
         return normalized
 
     token = doc[0]
     return _word_family_key_from_token(token, normalized)
 
+
+def _passes_cheap_word_checks(word):
+    """Length and function-verb checks that need no spaCy pipeline run."""
+    return len(word) >= MIN_WORD_LENGTH and word.lower() not in FUNCTION_VERBS
+
+
+def _is_meaningful_token(token, word):
+    """Token-level half of is_meaningful_word(), for callers that already have a Doc."""
+    if not _passes_cheap_word_checks(word):
+        return False
+
+    return token.pos_ in MEANINGFUL_POS_TAGS
+
+
+def _is_valid_random_target_token(token, w):
+    """Token-level half of is_valid_random_target_word(); `w` must already be normalized."""
+    if not _is_meaningful_token(token, w):
+        return False
+
+    if token.pos_ not in TARGET_POS_TAGS:
+        return False
+
+    # Extra guardrail for geographic-like targets.
+    if token.ent_type_ in DISALLOWED_TARGET_ENTITY_TYPES:
+        return False
+
+    # If lemma collapses to something too short, skip (e.g. 'days' -> 'day').
+    lemma = (token.lemma_ or "").lower().strip()
+    if lemma and lemma != w and len(lemma) < MIN_WORD_LENGTH:
+        return False
+
+    return True
+
 def is_meaningful_word(word):
     """
     Check if a word is meaningful and tangible (not a function word like 'the', 'a', 'is', etc.)
@@ -260,28 +553,15 @@ def is_meaningful_word(word):
     if nlp is None:
         return False
     
-    if len(word) < MIN_WORD_LENGTH:
+    # Cheap rejects first so function verbs and short words never reach the pipeline.
+    if not _passes_cheap_word_checks(word):
         return False
     
     doc = nlp(word)
     if len(doc) == 0:
         return False
     
-    token = doc[0]
-    
-    # Check POS tag
-    if token.pos_ not in MEANINGFUL_POS_TAGS:
-        return False
-    
-    # Additional check: exclude common auxiliary/function verbs even if tagged as VERB
-    function_verbs = {"be", "is", "are", "was", "were", "been", "being", 
-                      "have", "has", "had", "having", "do", "does", "did",
-                      "will", "would", "shall", "should", "may", "might",
-                      "can", "could", "must"}
-    if word.lower() in function_verbs:
-        return False
-    
-    return True
+    return _is_meaningful_token(doc[0], word)
 
 
 def is_valid_random_target_word(word: str) -> bool:
@@ -302,79 +582,62 @@ def is_valid_random_target_word(word: str) -> bool:
     if not w:
         return False
 
-    if not is_meaningful_word(w):
+    if not _passes_cheap_word_checks(w):
         return False
 
     doc = nlp(w)
     if len(doc) == 0:
         return False
 
-    token = doc[0]
-
-    if token.pos_ not in TARGET_POS_TAGS:
-        return False
-
-    # Extra guardrail for geographic-like targets.
-    if token.ent_type_ in DISALLOWED_TARGET_ENTITY_TYPES:
-        return False
-
-    # If lemma collapses to something too short, skip (e.g. 'days' -> 'day').
-    lemma = (token.lemma_ or "").lower().strip()
-    if lemma and lemma != w and len(lemma) < MIN_WORD_LENGTH:
-        return False
-
-    return True
+    return _is_valid_random_target_token(doc[0], w)
 
 class ContextoGame:
     def __init__(self):
+        self.profane_words = _profanity_future.result()
         self.vocab = None
         self.meaningful_vocab = None
         
         self.vocab_words = []
-        self.vocab_vectors = None
-        self.vocab_vector_norms = None
+        self.vocab_unit_vectors = None
+        self.zero_vector_rows = None
         self.vector_dim = 0
+        self.family_ids = None
+        self.family_id_keys = None
+        self.family_order = None
+        self.family_starts = None
         self.target_word = None
         self.target_vector = None
         self.target_vector_norm = None
+        self.target_unit_vector = None
         self.target_family_key = None
         self.ranks = {}
         self.ranked_vocab = []
+        # Family key of each `ranked_vocab` entry (parallel).
+        self.ranked_family_keys = []
         self.family_representatives = {}
-    
-    def _filter_meaningful_vocab(self):
-        """Filter vocabulary for random target selection.
-
-        Restricts targets to TARGET_POS_TAGS while also:
-        - respecting MIN_WORD_LENGTH
-        - excluding function words
-        - avoiding cases like 'days' -> 'day' (too short)
-        """
-        print("Filtering vocabulary for meaningful random target words...")
-        meaningful = []
-        for w in self.vocab[:2000]:
-            if not is_valid_random_target_word(w):
-                continue
-            meaningful.append(w)
-        print(f"Found {len(meaningful)} meaningful words from top 2000")
-        return meaningful
+        self.family_similarities = {}
+        self._top_10 = None
+        # get_hint_word results keyed by target rank; the ranking is fixed per target.
+        self._hint_words = {}
+        # Negated similarities of `ranked_vocab` (ascending) for np.searchsorted rank estimates.
+        self._neg_ranked_sims = np.zeros((0,), dtype=np.float64)
 
     async def initialize(self, target_word=None, emit_cb=None):
         nlp = get_nlp()
         if nlp is None:
             raise RuntimeError("Spacy model not loaded.")
 
-        if emit_cb:
-            await emit_cb("Filtering vectors for vocabulary...")
-        print("Filtering vectors for vocabulary...")
         await ensure_global_vocab_cache_async(emit_cb=emit_cb)
         self.vocab = _cached_vocab
         self.meaningful_vocab = _cached_meaningful_vocab
         self.vocab_words = _cached_vocab_words_with_vectors or []
-        self.vocab_vectors = _cached_vocab_vectors
-        self.vocab_vector_norms = _cached_vocab_vector_norms
+        self.vocab_unit_vectors = _cached_vocab_unit_vectors
+        self.zero_vector_rows = _cached_zero_vector_rows
+        self.family_ids = _cached_family_ids
+        self.family_id_keys = _cached_family_id_keys
+        self.family_order = _cached_family_order
+        self.family_starts = _cached_family_starts
         self.vector_dim = int(_cached_vector_dim or 0)
-        await asyncio.sleep(0)
                 
         if target_word:
             raw_target = target_word.lower().strip()
@@ -386,60 +649,117 @@ class ContextoGame:
         self.target_family_key = get_word_family_key(self.target_word)
 
         # Prefer a vectorized family key for the target if available.
-        target_lookup_word = self.target_word
-        lex = nlp.vocab[target_lookup_word]
+        found = _lookup_word_vector(self.target_word)
         if self.target_family_key != self.target_word:
-            fam_lex = nlp.vocab[self.target_family_key]
-            if fam_lex.has_vector:
-                lex = fam_lex
-                target_lookup_word = self.target_family_key
+            found = _lookup_word_vector(self.target_family_key) or found
 
-        if not lex.has_vector:
+        if found is None:
             raise ValueError(f"Target word '{self.target_word}' is out of vocabulary.")
-        self.target_vector = np.asarray(lex.vector, dtype=np.float32)
-        self.target_vector_norm = float(np.linalg.norm(self.target_vector) or 0.0)
+        self.target_vector, self.target_vector_norm = found
         if self.target_vector_norm == 0.0:
             raise ValueError(f"Target word '{self.target_word}' has no usable vector.")
+        self.target_unit_vector = self.target_vector / np.float32(self.target_vector_norm)
             
         await self._precompute_ranks(emit_cb)
 
-    def load_vocab(self):
-        return load_vocab()
-
     async def _precompute_ranks(self, emit_cb=None):
         if emit_cb:
             await emit_cb("Pre-computing ranks vs target...")
-        print(f"Pre-computing ranks vs target: {self.target_word}")
+        logger.info("Pre-computing ranks vs target: %s", self.target_word)
         self.ranked_vocab = []
         self.family_representatives = {}
+        self.family_similarities = {}
+        self._top_10 = None
+        self._hint_words = {}
 
-        family_best = {}
-        if self.vocab_vectors is None or self.vocab_vector_norms is None or self.target_vector is None:
+        if self.vocab_unit_vectors is None or self.zero_vector_rows is None or self.target_unit_vector is None:
             raise RuntimeError("Vectors not initialized.")
 
-        denom = (self.target_vector_norm or 0.0) * self.vocab_vector_norms
-        valid = denom > 0
+        # Rooms often reuse a target, so results are memoized per target word. The
+        # sweep and reduction are a few ms of NumPy work; run them off the event loop
+        # so other rooms' guesses aren't held up while this room initializes.
+        async with _target_ranks_lock:
+            computed = _target_ranks_cache.get(self.target_word)
+            if computed is None:
+                computed = await asyncio.to_thread(self._compute_ranks)
+                _target_ranks_cache[self.target_word] = computed
+                if len(_target_ranks_cache) > TARGET_RANKS_CACHE_SIZE:
+                    # dicts keep insertion order, so this evicts the oldest target.
+                    del _target_ranks_cache[next(iter(_target_ranks_cache))]
+            else:
+                logger.info("Reusing cached ranks for target: %s", self.target_word)
+
+        # Shared between games with the same target; nothing below mutates them.
+        (
+            self.ranked_family_keys,
+            self.ranked_vocab,
+            self._neg_ranked_sims,
+            self.ranks,
+            self.family_representatives,
+            self.family_similarities,
+        ) = computed
+
+    def _compute_ranks(self):
+        """Rank every vocab family against the target (blocking; see _precompute_ranks).
+
+        Returns (ranked_family_keys, ranked_vocab, neg_ranked_sims, ranks,
+        family_representatives, family_similarities).
+        """
         sims = np.full((len(self.vocab_words),), -1.0, dtype=np.float32)
-        if np.any(valid):
-            sims[valid] = (self.vocab_vectors[valid] @ self.target_vector) / denom[valid]
-
-        for i, word in enumerate(self.vocab_words):
-            family_key = (_cached_family_keys or {}).get(word) or get_word_family_key(word)
-            sim = float(sims[i])
-
-            best = family_best.get(family_key)
-            if best is None or sim > best[1]:
-                family_best[family_key] = (word, sim)
-
-            if i % 1000 == 0:
-                await asyncio.sleep(0)
-
-        self.ranked_vocab = sorted(family_best.values(), key=lambda x: x[1], reverse=True)
-        self.ranks = {}
-        for rank, (word, sim) in enumerate(self.ranked_vocab, start=1):
-            family_key = (_cached_family_keys or {}).get(word) or get_word_family_key(word)
-            self.ranks[family_key] = rank
-            self.family_representatives[family_key] = word
+        if len(self.vocab_words):
+            if self.vocab_unit_vectors.dtype == np.int8:
+                # Quantized rows lost their unit length, so use cosine distance instead of dot.
+                target = _quantize_rows_int8(self.target_unit_vector)
+                distances = simsimd.cdist(target, self.vocab_unit_vectors, metric="cosine")
+                sims = 1.0 - np.asarray(distances, dtype=np.float32).ravel()
+            else:
+                # Rows are unit-length, so a dot product is the cosine similarity.
+                target = self.target_unit_vector.astype(self.vocab_unit_vectors.dtype)
+                sims = np.asarray(
+                    simsimd.cdist(target[None, :], self.vocab_unit_vectors, metric="dot"),
+                    dtype=np.float32,
+                ).ravel()
+            # Zero vectors can't be compared; keep them at the bottom of the ranking.
+            sims[self.zero_vector_rows] = -1.0
+
+        # Family reduction over rows grouped by family: max per run, then the first row
+        # in each run that reaches it (lowest row wins ties, as in vocab order).
+        family_ids = self.family_ids
+        family_order = self.family_order
+        grouped_ids = family_ids[family_order]
+        grouped_sims = sims[family_order]
+        best_sims = np.maximum.reduceat(grouped_sims, self.family_starts)
+        candidates = np.flatnonzero(grouped_sims == best_sims[grouped_ids])
+        first_in_run = np.ones(len(candidates), dtype=bool)
+        first_in_run[1:] = grouped_ids[candidates[1:]] != grouped_ids[candidates[:-1]]
+        rows = family_order[candidates[first_in_run]]
+
+        # Stable argsort on the float32 sims (ties keep vocab order, like the old sorted()).
+        order = np.argsort(-sims[rows], kind="stable")
+        ranked_rows = rows[order]
+        family_id_keys = self.family_id_keys
+        ranked_family_keys = [family_id_keys[i] for i in family_ids[ranked_rows].tolist()]
+        ranked_words = [self.vocab_words[row] for row in ranked_rows.tolist()]
+        ranked_sims = sims[ranked_rows].tolist()
+        # Quantized sweeps only order the families; the similarities shown to players
+        # then come from the float32 model vectors in process_guess.
+        family_similarities = (
+            dict(zip(ranked_family_keys, ranked_sims))
+            if self.vocab_unit_vectors.dtype == np.float32
+            else {}
+        )
+        return (
+            ranked_family_keys,
+            list(zip(ranked_words, ranked_sims)),
+            -sims[ranked_rows].astype(np.float64),
+            dict(zip(ranked_family_keys, range(1, len(ranked_words) + 1))),
+            dict(zip(ranked_family_keys, ranked_words)),
+            family_similarities,
+        )
+
+    def _estimate_rank(self, similarity):
+        """Rank a similarity against `ranked_vocab`: 1 + number of families scoring higher."""
+        return int(np.searchsorted(self._neg_ranked_sims, -similarity, side="left")) + 1
 
     def process_guess(self, guess):
         raw_guess = guess
@@ -448,41 +768,43 @@ class ContextoGame:
         if len(guess) == 0:
             return {"error": "Empty guess"}
 
-        if not re.fullmatch(r"[a-z]+", guess):
+        # Same as fullmatch("[a-z]+") on the lowercased guess, without the regex engine.
+        if not (guess.isascii() and guess.isalpha()):
             return {"error": "Letters only (A–Z), single word"}
             
-        if profanity.contains_profanity(guess):
+        if guess in self.profane_words:
             return {"error": "NSFW/Profane word rejected"}
             
         if " " in guess:
             return {"error": "Single words only"}
             
         family_key = get_word_family_key(guess)
-        search_word = self.family_representatives.get(family_key, guess)
         nlp = get_nlp()
         if nlp is None:
             return {"error": "Dictionary unavailable (model not loaded)"}
 
-        if self.target_vector is None or not self.target_vector_norm:
+        if self.target_unit_vector is None:
             return {"error": "Game not ready"}
 
-        lex = nlp.vocab[search_word]
-        if not lex.has_vector:
-            lex = nlp.vocab[guess]
-            if not lex.has_vector:
+        # With a float32 matrix, ranked families already have their representative's
+        # similarity from the sweep in _precompute_ranks; otherwise look up its vector.
+        similarity = self.family_similarities.get(family_key)
+        if similarity is None:
+            representative = self.family_representatives.get(family_key)
+            found = (representative and _lookup_word_vector(representative)) or _lookup_word_vector(guess)
+            if found is None:
                 return {"error": "Word not found in dictionary"}
 
-        guess_vec = np.asarray(lex.vector, dtype=np.float32)
-        guess_norm = float(np.linalg.norm(guess_vec) or 0.0)
-        if guess_norm == 0.0:
-            return {"error": "Word vector unavailable"}
+            guess_vec, guess_norm = found
+            if guess_norm == 0.0:
+                return {"error": "Word vector unavailable"}
 
-        similarity = float((guess_vec @ self.target_vector) / (guess_norm * self.target_vector_norm))
+            similarity = float(guess_vec @ self.target_unit_vector) / guess_norm
         
         rank = self.ranks.get(family_key, None)
         if rank is None:
             # Estimate rank for valid words not in top 10k list
-            rank = sum(1 for _, sim in self.ranked_vocab if sim > similarity) + 1
+            rank = self._estimate_rank(similarity)
             
         is_correct = (family_key == self.target_family_key)
         
@@ -498,49 +820,54 @@ class ContextoGame:
         }
 
         if is_correct:
-            top_words = []
-            for w, s in self.ranked_vocab:
-                family = (_cached_family_keys or {}).get(w) or get_word_family_key(w)
-                if family == self.target_family_key:
-                    continue
-                top_words.append((family, s))
-                if len(top_words) == 10:
-                    break
-            result["top_10"] = [
-                {
-                    "word": w,
-                    "similarity": float(s),
-                    "rank": self.ranks.get(w, r + 2),
-                }
-                for r, (w, s) in enumerate(top_words)
-            ]
+            result["top_10"] = self._get_top_10()
             
         return result
 
+    def _get_top_10(self):
+        """Nearest 10 families to the target, computed once per game on the first win."""
+        if self._top_10 is not None:
+            return self._top_10
+
+        # `ranked_vocab` is already sorted, so the neighbors are a short prefix scan.
+        top_words = []
+        for family, (_, s) in zip(self.ranked_family_keys, self.ranked_vocab):
+            if family == self.target_family_key:
+                continue
+            top_words.append((family, s))
+            if len(top_words) == 10:
+                break
+        self._top_10 = [
+            {
+                "word": w,
+                "similarity": float(s),
+                "rank": self.ranks.get(w, r + 2),
+            }
+            for r, (w, s) in enumerate(top_words)
+        ]
+        return self._top_10
+
     def get_hint_word(self, best_rank=None):
         if best_rank is None or best_rank > 300:
             target_rank = 300
         else:
             target_rank = max(1, best_rank // 2)
-            
-        # Because guesses are normalized to strict word families, search downward to find
-        # a family representative that evaluates to <= target_rank.
-        start_idx = min(target_rank - 1, len(self.ranked_vocab) - 1)
-        for idx in range(start_idx, -1, -1):
-            w = self.ranked_vocab[idx][0]
-            family_key = (_cached_family_keys or {}).get(w) or get_word_family_key(w)
 
-            if family_key == self.target_family_key:
-                continue
+        hint_word = self._hint_words.get(target_rank)
+        if hint_word is None:
+            hint_word = self._hint_words[target_rank] = self._find_hint_word(target_rank)
+        return hint_word
 
-            # `ranked_vocab` is already unique per family and sorted by similarity.
-            # So idx+1 is effectively the rank for that family.
-            rank = self.ranks.get(family_key, idx + 1)
-            if rank <= target_rank:
-                return w
+    def _find_hint_word(self, target_rank):
+        # `ranked_vocab` is unique per family and sorted by similarity, so idx+1 is the
+        # family's rank: the first non-target family at or below index target_rank-1 wins.
+        start_idx = min(target_rank - 1, len(self.ranked_vocab) - 1)
+        for idx in range(start_idx, -1, -1):
+            if self.ranked_family_keys[idx] != self.target_family_key:
+                return self.ranked_vocab[idx][0]
                 
         # Fallback if nothing is found
-        for w, _ in self.ranked_vocab:
-            if ((_cached_family_keys or {}).get(w) or get_word_family_key(w)) != self.target_family_key:
-                return w
+        for idx, family_key in enumerate(self.ranked_family_keys):
+            if family_key != self.target_family_key:
+                return self.ranked_vocab[idx][0]
         return self.ranked_vocab[0][0]
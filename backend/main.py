@@ -1,49 +1,123 @@
 import uvicorn
 import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
 from fastapi import FastAPI
 import socketio
 import os
-from game_logic import ContextoGame
+from game_logic import ContextoGame, ensure_global_vocab_cache_async
+from orjson_serializer import OrjsonSerializer
+
+# Handlers only enqueue records; a listener thread does the actual stream writes, so
+# logging from socket handlers never blocks the event loop on stdout.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# QueueHandler.prepare() bakes the formatted text into the record; keep that to the bare
+# message (plus any traceback) so the listener's formatter adds the prefix only once.
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
 
 # Setup Socket.io and FastAPI
-sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*', json=OrjsonSerializer)
 app = FastAPI()
-sio_app = socketio.ASGIApp(sio, other_asgi_app=app)
 
-# Store active rooms. Key: room_id, Value: {"game": ContextoGame, "guesses": [], "players": []}
+
+async def warmup():
+    """Load the shared spaCy model and vocab matrix before the first room needs them."""
+    try:
+        await ensure_global_vocab_cache_async()
+        logger.info("Vocab cache warmed up")
+    except Exception as e:
+        # Rooms retry on join, so a failed warmup shouldn't keep the server down.
+        logger.error("Warmup failed: %s", e)
+
+
+_warmup_task = None
+
+
+async def start_warmup():
+    # Runs in the background so the port binds and /health answers right away (Railway's
+    # healthcheck can't wait out a cold vocab build); rooms that join meanwhile wait on
+    # the cache build lock instead of starting a second build.
+    global _warmup_task
+    _warmup_task = asyncio.create_task(warmup())
+
+
+# engineio's ASGIApp answers lifespan events itself once given a startup hook (and never
+# forwards them to FastAPI), so the warmup is registered here, not via @app.on_event.
+sio_app = socketio.ASGIApp(sio, other_asgi_app=app, on_startup=start_warmup)
+
+# Store active rooms. Key: room_id, Value: {"game": ContextoGame, "guesses": [], "players": set(), ...}
 rooms = {}
 
 # Map sid to player info for easy cleanup on disconnect
 sid_to_info = {}
 
+# Guesses are broadcast as "guess_batch" events: make_guess queues entries on the room's
+# outbox and the first entry in a window schedules one flush, so a burst of guesses in a
+# busy room costs one emit per room instead of one per guess.
+GUESS_BATCH_WINDOW_SECONDS = 0.02
+GUESS_BATCH_MAX_SIZE = 32
+
+# Cap on rooms initializing at once. The spaCy model and vocab matrix are shared, but
+# each init still allocates its own rank tables and holds a worker thread, so a burst
+# of new rooms queues here instead of stacking those up.
+MAX_CONCURRENT_INITS = 2
+_init_semaphore = asyncio.Semaphore(MAX_CONCURRENT_INITS)
+
 def _get_room_state(room_id: str):
     room = rooms[room_id]
-    ready = bool(room.get("ready"))
-    game = room.get("game")
     return {
         "guesses": room["guesses"],
-        "total_words": len(game.ranked_vocab) if (ready and game is not None) else 0,
-        "players": list(room["players"]),
-        "ready": ready,
+        "total_words": room["total_words"],
+        "players": room["players_snapshot"],
+        "ready": room["ready"],
     }
 
+async def _flush_guess_batch(room_id: str):
+    await asyncio.sleep(GUESS_BATCH_WINDOW_SECONDS)
+    room = rooms.get(room_id)
+    if room is None:
+        return
+    outbox = room["outbox"]
+    try:
+        # Guesses queued while an emit is in flight go out in the next loop iteration.
+        while outbox:
+            batch = outbox[:GUESS_BATCH_MAX_SIZE]
+            del outbox[:GUESS_BATCH_MAX_SIZE]
+            await sio.emit("guess_batch", {"guesses": batch}, room=room_id)
+    except Exception as e:
+        logger.warning("guess_batch emit failed for room %s: %s", room_id, e)
+    finally:
+        room["flush_task"] = None
+
 @sio.event
 async def connect(sid, environ):
-    print(f"Client connected: {sid}")
+    logger.info("Client connected: %s", sid)
 
 @sio.event
 async def disconnect(sid):
-    print(f"Client disconnected: {sid}")
+    logger.info("Client disconnected: %s", sid)
     if sid in sid_to_info:
         info = sid_to_info.pop(sid)
         room_id = info["room_id"]
         player_name = info["player_name"]
         
         if room_id in rooms and player_name in rooms[room_id]["players"]:
-            rooms[room_id]["players"].remove(player_name)
+            room = rooms[room_id]
+            room["players"].remove(player_name)
+            room["players_snapshot"] = tuple(room["players"])
             await sio.emit("player_left", {
                 "player_name": player_name, 
-                "players": list(rooms[room_id]["players"])
+                "players": room["players_snapshot"]
             }, room=room_id)
 
 @sio.event
@@ -58,12 +132,19 @@ async def join_room(sid, data):
         
     # Initialize room if it doesn't exist
     if room_id not in rooms:
-        print(f"Creating new room: {room_id}" + (f" with target word: {target_word}" if target_word else ""))
+        logger.info("Creating new room: %s%s", room_id, f" with target word: {target_word}" if target_word else "")
         rooms[room_id] = {
             "game": None,
             "guesses": [], # List of guess objects
+            "guessed_words": set(),  # words in `guesses`, for O(1) duplicate checks
+            "best_rank": None,  # lowest rank in `guesses`, kept up to date by make_guess
             "players": set(),
+            # Immutable copy of `players` for payloads, rebuilt only on join/leave.
+            "players_snapshot": (),
             "init_task": None,
+            "outbox": [],  # guess entries waiting for the next guess_batch
+            "flush_task": None,
+            "total_words": 0,  # len(game.ranked_vocab), set once the game is ready
             "ready": False,
         }
         
@@ -72,40 +153,46 @@ async def join_room(sid, data):
             
         async def init_game():
             try:
-                game = ContextoGame()
-                await game.initialize(target_word=target_word, emit_cb=emit_progress)
+                async with _init_semaphore:
+                    game = ContextoGame()
+                    await game.initialize(target_word=target_word, emit_cb=emit_progress)
                 rooms[room_id]["game"] = game
+                rooms[room_id]["total_words"] = len(game.ranked_vocab)
                 rooms[room_id]["ready"] = True
-                await sio.emit("room_loading", {"msg": ""}, room=room_id)
-                await sio.emit("room_state", _get_room_state(room_id), room=room_id)
+                await asyncio.gather(
+                    sio.emit("room_loading", {"msg": ""}, room=room_id),
+                    sio.emit("room_state", _get_room_state(room_id), room=room_id),
+                )
             except Exception as e:
-                print(f"Failed to initialize game for room {room_id}: {e}")
+                logger.error("Failed to initialize game for room %s: %s", room_id, e)
                 await sio.emit("error", {"msg": "Failed to initialize game"}, room=room_id)
                 
         rooms[room_id]["init_task"] = asyncio.create_task(init_game())
         
     await sio.enter_room(sid, room_id)
     rooms[room_id]["players"].add(player_name)
+    rooms[room_id]["players_snapshot"] = tuple(rooms[room_id]["players"])
     sid_to_info[sid] = {"room_id": room_id, "player_name": player_name}
     
-    # Notify room someone joined
-    await sio.emit("player_joined", {
-        "player_name": player_name,
-        "players": list(rooms[room_id]["players"])
-    }, room=room_id)
-
-    # Non-blocking join: send state immediately, then broadcast updated state when ready.
-    await sio.emit("room_state", _get_room_state(room_id), to=sid)
+    # Notify room someone joined, and (non-blocking join) send the joiner the current
+    # state right away; init_game broadcasts the updated state when ready.
+    await asyncio.gather(
+        sio.emit("player_joined", {
+            "player_name": player_name,
+            "players": rooms[room_id]["players_snapshot"]
+        }, room=room_id),
+        sio.emit("room_state", _get_room_state(room_id), to=sid),
+    )
 
 @sio.event
 async def make_guess(sid, data):
-    print(f"Received make_guess from {sid}: {data}")
+    logger.debug("Received make_guess from %s: %s", sid, data)
     room_id = data.get("room_id")
     player_name = data.get("player_name")
     guess_word = data.get("guess")
     
     if not room_id or not guess_word:
-        print("make_guess aborted: missing room_id or guess")
+        logger.debug("make_guess aborted: missing room_id or guess")
         return
         
     room = rooms.get(room_id)
@@ -121,13 +208,18 @@ async def make_guess(sid, data):
     if game is None:
         await sio.emit("guess_error", {"msg": "Game is still initializing. Please wait."}, to=sid)
         return
+    await _apply_guess(sid, room_id, room, game, player_name, guess_word)
+
+async def _apply_guess(sid, room_id, room, game, player_name, guess_word):
+    """Score a guess against a ready room's game and queue it for broadcast.
+
+    Callers have already validated the room; make_guess and request_hint both land here.
+    """
     try:
-        result = game.process_guess(guess_word)
-    except Exception as e:
-        print("process_guess failed:", e)
-        # print stack trace:
-        import traceback
-        traceback.print_exc()
+        # Out-of-vocab guesses run the spaCy tagger; keep that off the event loop.
+        result = await asyncio.to_thread(game.process_guess, guess_word)
+    except Exception:
+        logger.exception("process_guess failed")
         await sio.emit("error", {"msg": "Internal server error during guess"}, to=sid)
         return
 
@@ -136,29 +228,35 @@ async def make_guess(sid, data):
         return
         
     # Valid guess, attach player info
+    word = result["word"]
+    rank = result["rank"]
     guess_entry = {
-        "word": result["word"],
+        "word": word,
         "raw_guess": result.get("raw_guess"),
         "similarity": result["similarity"],
-        "rank": result["rank"],
+        "rank": rank,
         "player_name": player_name,
         "is_correct": result["is_correct"]
     }
     
-    if "top_10" in result:
-        guess_entry["top_10"] = result["top_10"]
-    
     # Check if word already guessed in this room to avoid duplicates
-    if not any(g["word"] == guess_entry["word"] for g in room["guesses"]):
+    guessed_words = room["guessed_words"]
+    if word not in guessed_words:
+        # Only the first correct guess carries top_10; clients (and room_state for late
+        # joiners) already have it, so repeats of the winning word broadcast without it.
+        if "top_10" in result:
+            guess_entry["top_10"] = result["top_10"]
+        guessed_words.add(word)
         room["guesses"].append(guess_entry)
+        best_rank = room["best_rank"]
+        if rank is not None and (best_rank is None or rank < best_rank):
+            room["best_rank"] = rank
         
-    print("Emitting new_guess:", guess_entry, "to room:", room_id)
-    # Broadcast to everyone in the room
-    try:
-        await sio.emit("new_guess", guess_entry, room=room_id)
-        print("Emit success!")
-    except Exception as e:
-        print("Emit failed:", e)
+    logger.debug("Queueing guess %s for room %s", guess_entry, room_id)
+    # Broadcast to everyone in the room with the next batch
+    room["outbox"].append(guess_entry)
+    if room["flush_task"] is None:
+        room["flush_task"] = asyncio.create_task(_flush_guess_batch(room_id))
 
 @sio.event
 async def request_hint(sid, data):
@@ -181,19 +279,10 @@ async def request_hint(sid, data):
         await sio.emit("guess_error", {"msg": "Game is still initializing. Please wait."}, to=sid)
         return
     
-    best_rank = None
-    for g in room["guesses"]:
-        if g["rank"] is not None:
-            if best_rank is None or g["rank"] < best_rank:
-                best_rank = g["rank"]
-                
+    best_rank = room["best_rank"]
     hint_word = game.get_hint_word(best_rank)
     if hint_word:
-        await make_guess(sid, {
-            "room_id": room_id,
-            "player_name": player_name,
-            "guess": hint_word
-        })
+        await _apply_guess(sid, room_id, room, game, player_name, hint_word)
 
 
 @app.get("/health")
@@ -205,4 +294,15 @@ app = sio_app
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "8000"))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=False)
+    # Single worker: rooms live in this process's memory. uvloop/httptools come with
+    # uvicorn[standard], which fastapi pulls in, except uvloop on Windows; "auto" uses
+    # uvloop wherever it's installed (railway.toml pins it explicitly).
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="httptools",
+        ws="websockets",
+        reload=False,
+    )
@@ -0,0 +1,15 @@
+import orjson
+
+
+class OrjsonSerializer:
+    """json-module stand-in for python-socketio packets, backed by orjson.
+
+    Pass as `json=` to socketio servers and clients. Packet encoders pass stdlib
+    options like `separators`; orjson output is already compact, so they're ignored.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    loads = staticmethod(orjson.loads)
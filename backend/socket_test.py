@@ -1,7 +1,8 @@
 import socketio
 import time
+from orjson_serializer import OrjsonSerializer
 
-sio = socketio.Client()
+sio = socketio.Client(json=OrjsonSerializer)
 
 @sio.event
 def connect():
@@ -22,8 +23,8 @@ def room_loading(data):
         print("Loading:", data.get("msg"))
 
 @sio.event
-def new_guess(data):
-    print("Received new guess instantly:", data)
+def guess_batch(data):
+    print("Received new guess batch:", data["guesses"])
     sio.disconnect()
 
 @sio.event
@@ -1,10 +1,17 @@
 import asyncio
+import os
+import tempfile
+import types
+
+import numpy as np
+
+import game_logic
 from game_logic import (
     ContextoGame,
+    get_nlp,
     get_word_family_key,
     is_meaningful_word,
     is_valid_random_target_word,
-    nlp,
 )
 
 
@@ -48,6 +55,22 @@ def test_is_meaningful_word():
     print("\n✅ is_meaningful_word tests passed!\n")
 
 
+def test_trimmed_pipeline_lemmas():
+    print("=== Testing trimmed spaCy pipeline ===\n")
+
+    nlp = get_nlp()
+    assert nlp is not None, "Spacy model not loaded"
+    for name in ("parser", "ner"):
+        assert name not in nlp.pipe_names, f"'{name}' should be excluded from the pipeline"
+
+    # The lemmatizer depends on tagger + attribute_ruler POS; make sure it still works.
+    doc = nlp("cats")
+    print(f"  cats -> {doc[0].lemma_} ({doc[0].pos_})")
+    assert doc[0].lemma_ == "cat", "Lemmatizer should still map 'cats' -> 'cat'"
+
+    print("\n✅ trimmed pipeline tests passed!\n")
+
+
 def test_strict_word_family_grouping():
     print("=== Testing strict word family grouping (plural + comparative + verb inflections) ===\n")
 
@@ -108,6 +131,7 @@ def test_strict_word_family_grouping():
 
 async def test_contexto_game():
     print("=== Testing ContextoGame ===\n")
+    nlp = get_nlp()
 
     print("Initializing test game with target 'apple'...")
     game = ContextoGame()
@@ -132,6 +156,9 @@ async def test_contexto_game():
 
     print("\n--- Validating Constraints ---")
     assert game.process_guess("shit").get("error") == "NSFW/Profane word rejected", "NSFW test failed"
+    # Censor-list variants are expanded from better_profanity internals; catch upgrades that change them.
+    assert game.process_guess("fvck").get("error") == "NSFW/Profane word rejected", "NSFW variant test failed"
+    assert "error" not in game.process_guess("fruit"), "Clean vocab word should not be rejected"
     assert game.process_guess("asdfghjkl").get("error") == "Word not found in dictionary", "Out of vocab test failed"
     assert "error" in game.process_guess("two words"), "Multi-word test failed"
 
@@ -200,9 +227,66 @@ async def test_contexto_game():
     print("\n✅ ContextoGame tests passed!\n")
 
 
+def test_vocab_cache_invalidation():
+    print("=== Testing on-disk vocab cache invalidation ===\n")
+
+    # _vocab_cache_tag only reads nlp.meta, so no model is needed here.
+    nlp = types.SimpleNamespace(meta={"lang": "en", "name": "core_web_md", "version": "3.7.1"})
+    meaningful_vocab = ["apple", "garden"]
+    family_keys = {"apple": "apple", "apples": "apple", "garden": "garden"}
+    words = ["apple", "apples", "garden"]
+    unit_vectors = np.eye(3, dtype=np.float32)
+    norms = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+
+    saved_paths = (game_logic.VOCAB_FILE, game_logic.VOCAB_VECTORS_CACHE_FILE)
+    saved_version = game_logic.VOCAB_CACHE_VERSION
+    with tempfile.TemporaryDirectory() as tmp:
+        game_logic.VOCAB_FILE = os.path.join(tmp, "vocab.txt")
+        game_logic.VOCAB_VECTORS_CACHE_FILE = os.path.join(tmp, "vocab_vectors.npz")
+        try:
+            with open(game_logic.VOCAB_FILE, "w") as f:
+                f.write("\n".join(words))
+            game_logic._save_vocab_cache(nlp, meaningful_vocab, family_keys, words, unit_vectors, norms)
+
+            loaded = game_logic._load_vocab_cache(nlp)
+            assert loaded is not None, "Fresh cache should load"
+            assert loaded[0] == meaningful_vocab, "meaningful_vocab should round-trip"
+            assert loaded[1] == family_keys, "family keys should round-trip"
+            assert loaded[2] == words, "words should round-trip"
+            assert np.array_equal(loaded[3], unit_vectors), "unit vectors should round-trip"
+            assert np.array_equal(loaded[4], norms), "norms should round-trip"
+            print("  round-trip ✓")
+
+            other_model = types.SimpleNamespace(meta=dict(nlp.meta, version="3.8.0"))
+            assert game_logic._load_vocab_cache(other_model) is None, "Another model version must rebuild"
+            game_logic.VOCAB_CACHE_VERSION = saved_version + 1
+            assert game_logic._load_vocab_cache(nlp) is None, "A bumped VOCAB_CACHE_VERSION must rebuild"
+            game_logic.VOCAB_CACHE_VERSION = saved_version
+            print("  tag mismatch -> rebuild ✓")
+
+            cache_mtime = os.path.getmtime(game_logic.VOCAB_VECTORS_CACHE_FILE)
+            os.utime(game_logic.VOCAB_FILE, (cache_mtime + 10, cache_mtime + 10))
+            assert game_logic._load_vocab_cache(nlp) is None, "A newer vocab.txt must rebuild"
+            os.utime(game_logic.VOCAB_FILE, (cache_mtime - 10, cache_mtime - 10))
+            assert game_logic._load_vocab_cache(nlp) is not None, "Cache should load again once it's newer"
+            print("  stale vocab.txt -> rebuild ✓")
+
+            with open(game_logic.VOCAB_VECTORS_CACHE_FILE, "wb") as f:
+                f.write(b"not an npz file")
+            assert game_logic._load_vocab_cache(nlp) is None, "An unreadable cache must rebuild"
+            print("  unreadable file -> rebuild ✓")
+        finally:
+            game_logic.VOCAB_FILE, game_logic.VOCAB_VECTORS_CACHE_FILE = saved_paths
+            game_logic.VOCAB_CACHE_VERSION = saved_version
+
+    print("\n✅ vocab cache invalidation tests passed!\n")
+
+
 async def run_tests():
     # test_is_meaningful_word()
+    test_trimmed_pipeline_lemmas()
     test_strict_word_family_grouping()
+    test_vocab_cache_invalidation()
     await test_contexto_game()
     print("✅ All automated tests passed successfully.")
 
@@ -8,6 +8,7 @@ import socketio
 import sys
 import time
 import threading
+from orjson_serializer import OrjsonSerializer
 
 # Words that should NEVER be selected as targets
 FUNCTION_WORDS = {
@@ -33,7 +34,7 @@ def test_room_creation():
 
     for i in range(5):
         room_id = f"TEST_ROOM_{i}_{time.time()}"
-        sio = socketio.Client()
+        sio = socketio.Client(json=OrjsonSerializer)
         got_any_state = threading.Event()
         got_ready_state = threading.Event()
 
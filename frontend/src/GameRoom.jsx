@@ -60,7 +60,7 @@ export default function GameRoom({ roomId, playerName, onLeave }) {
       }
     });
 
-    socket.on("new_guess", (guess) => {
+    const handleGuess = (guess) => {
       setGuesses((prev) => {
         const existingIndex = prev.findIndex((g) => g.word === guess.word);
         const newGuesses = [...prev];
@@ -113,6 +113,11 @@ export default function GameRoom({ roomId, playerName, onLeave }) {
           setTimeout(() => setToast(""), 2500);
         }
       }
+    };
+
+    // The server batches guesses made within a short window into one event.
+    socket.on("guess_batch", (data) => {
+      data.guesses.forEach(handleGuess);
     });
 
     socket.on("player_joined", (data) => {
@@ -151,7 +156,7 @@ export default function GameRoom({ roomId, playerName, onLeave }) {
     return () => {
       socket.off("room_loading");
       socket.off("room_state");
-      socket.off("new_guess");
+      socket.off("guess_batch");
       socket.off("player_joined");
       socket.off("player_left");
       socket.off("guess_error");